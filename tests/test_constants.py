@@ -0,0 +1,20 @@
+from wordpress_logins_finder.utils.constants import Config, strip_scheme, targets_to_check
+
+
+def test_strip_scheme():
+    assert strip_scheme('https://example.com') == 'example.com'
+    assert strip_scheme('http://example.com') == 'example.com'
+    assert strip_scheme('ftp://example.com') == 'ftp://example.com'
+
+
+def test_targets_to_check():
+    target_urls = targets_to_check('https://example.com')
+
+    page_urls = [url for url in target_urls if '&page=' in url]
+    assert page_urls == [
+        f'https://example.com/wp-json/wp/v2/users?per_page={Config.USERS_PER_PAGE}&page={page}'
+        for page in range(1, Config.USERS_PAGES_TO_CHECK + 1)
+    ]
+    assert target_urls[-1] == 'https://example.com/wp-json/wp/v2/users?search=admin@example.com'
+    assert len(target_urls) == 5 + Config.USERS_PAGES_TO_CHECK + 1
+    assert len(set(target_urls)) == len(target_urls)
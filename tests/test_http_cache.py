@@ -0,0 +1,75 @@
+from wordpress_logins_finder.utils.constants import Config
+from wordpress_logins_finder.utils.http_cache import HttpCache
+
+URL = 'https://example.com/wp-json/wp/v2/users'
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'cache' / 'http_cache.json')
+    cache = HttpCache(path=path)
+    cache.set_schema('example.com', 'https')
+    cache.set_response(URL, 200, [{'id': 1}], etag='"abc"', last_modified=None)
+    cache.save()
+
+    loaded = HttpCache.load(path)
+    assert loaded.get_schema('example.com') == 'https'
+    assert loaded.get_response(URL) == {'url': URL, 'status_code': 200, 'body': [{'id': 1}]}
+
+
+def test_conditional_headers():
+    cache = HttpCache()
+    assert cache.conditional_headers(URL) == {}
+
+    cache.set_response(URL, 200, [], etag='"abc"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    assert cache.conditional_headers(URL) == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+
+
+def test_response_without_validators_is_not_kept():
+    cache = HttpCache()
+    cache.set_response(URL, 200, [], etag='"abc"', last_modified=None)
+    cache.set_response(URL, 200, [], etag=None, last_modified=None)
+    assert cache.get_response(URL) is None
+
+
+def test_delete_response():
+    cache = HttpCache()
+    cache.set_response(URL, 200, [], etag='"abc"', last_modified=None)
+    cache.delete_response(URL)
+    assert cache.get_response(URL) is None
+    assert cache.conditional_headers(URL) == {}
+
+
+def test_expired_schema(monkeypatch):
+    cache = HttpCache()
+    cache.set_schema('example.com', 'https')
+    monkeypatch.setattr(Config, 'SCHEMA_CACHE_TTL', -1)
+    assert cache.get_schema('example.com') is None
+
+
+def test_load_missing_file(tmp_path):
+    cache = HttpCache.load(str(tmp_path / 'missing.json'))
+    assert cache.get_response(URL) is None
+
+
+def test_load_corrupt_files(tmp_path):
+    path = tmp_path / 'http_cache.json'
+    for content in (b'not json', b'[1,2]', b'{"schemas": [1], "responses": "x"}'):
+        path.write_bytes(content)
+        cache = HttpCache.load(str(path))
+        assert cache.get_schema('example.com') is None
+        assert cache.get_response(URL) is None
+
+
+def test_load_skips_malformed_entries(tmp_path):
+    path = tmp_path / 'http_cache.json'
+    path.write_bytes(
+        b'{"schemas": {"example.com": "https", "example.org": {"schema": "http", "probed_at": 9e18}},'
+        b' "responses": {"%s": {"status_code": 200}}}' % URL.encode()
+    )
+    cache = HttpCache.load(str(path))
+    assert cache.get_schema('example.com') is None
+    assert cache.get_schema('example.org') == 'http'
+    assert cache.get_response(URL) is None
@@ -0,0 +1,21 @@
+import logging
+
+from wordpress_logins_finder.utils.logger_formater import OneLineExceptionFormatter
+
+
+def test_logger_initialisation_configures_package_logger(monkeypatch):
+    monkeypatch.delenv('LOGLEVEL', raising=False)
+    package_logger = logging.getLogger('wordpress_logins_finder.utils')
+    main_logger = logging.getLogger('__main__')
+    handlers = package_logger.handlers[:], main_logger.handlers[:]
+    levels = package_logger.level, main_logger.level
+    try:
+        OneLineExceptionFormatter.logger_initialisation(debug=True)
+        assert package_logger.level == logging.DEBUG
+        assert logging.getLogger('wordpress_logins_finder.utils.request_manager').isEnabledFor(logging.DEBUG)
+        assert isinstance(package_logger.handlers[-1].formatter, OneLineExceptionFormatter)
+        assert not logging.getLogger('httpx').isEnabledFor(logging.DEBUG)
+    finally:
+        package_logger.handlers[:], main_logger.handlers[:] = handlers
+        package_logger.setLevel(levels[0])
+        main_logger.setLevel(levels[1])
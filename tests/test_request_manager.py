@@ -0,0 +1,226 @@
+import asyncio
+
+import httpx
+
+from wordpress_logins_finder.utils.constants import Config
+from wordpress_logins_finder.utils.http_cache import HttpCache
+from wordpress_logins_finder.utils.request_manager import RequestManager, probe_target_schema, retry_delay
+
+URL = 'https://example.com/wp-json/wp/v2/users'
+
+
+async def _stream_chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def _read_body(handler):
+    async def read():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            async with client.stream('GET', URL) as response:
+                return await RequestManager._read_body(URL, response)
+
+    return asyncio.run(read())
+
+
+def test_read_body_within_limit(monkeypatch):
+    monkeypatch.setattr(Config, 'MAX_RESPONSE_SIZE', 10)
+    assert _read_body(lambda request: httpx.Response(200, content=b'[1, 2]')) == b'[1, 2]'
+
+
+def test_read_body_rejects_large_content_length(monkeypatch):
+    monkeypatch.setattr(Config, 'MAX_RESPONSE_SIZE', 10)
+    assert _read_body(lambda request: httpx.Response(200, content=b'x' * 11)) is None
+
+
+def test_read_body_rejects_large_stream(monkeypatch):
+    monkeypatch.setattr(Config, 'MAX_RESPONSE_SIZE', 10)
+    response = _read_body(lambda request: httpx.Response(200, content=_stream_chunks([b'x' * 6, b'x' * 6])))
+    assert response is None
+
+
+def _fetch(handler, url=URL, cache=None, **client_kwargs):
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), **client_kwargs) as client:
+            manager = RequestManager(urls=[url], session=client, cache=cache)
+            return await manager._fetch(url, client), manager.failed_requests_num
+
+    return asyncio.run(fetch())
+
+
+def test_retry_delay_range():
+    for attempt in range(2, 6):
+        delay = Config.RETRY_BACKOFF_START * 2 ** (attempt - 2)
+        for _ in range(100):
+            assert delay / 2 <= retry_delay(attempt) <= delay
+
+
+def test_retry_delay_cap():
+    for _ in range(100):
+        assert Config.RETRY_BACKOFF_MAX / 2 <= retry_delay(100) <= Config.RETRY_BACKOFF_MAX
+
+
+def test_fetch_retries_retry_status_codes(monkeypatch):
+    monkeypatch.setattr(Config, 'RETRY_BACKOFF_START', 0)
+    statuses = iter([503, 200])
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        if request.method == 'HEAD':
+            return httpx.Response(200)
+        return httpx.Response(next(statuses), json=[{'id': 1}])
+
+    result, failed_requests_num = _fetch(handler)
+    assert result == {'url': URL, 'status_code': 200, 'body': [{'id': 1}]}
+    assert failed_requests_num == 1
+    assert requests == ['HEAD', 'GET', 'GET']
+
+
+def test_fetch_retries_head_retry_status_codes(monkeypatch):
+    monkeypatch.setattr(Config, 'RETRY_BACKOFF_START', 0)
+    head_statuses = iter([503, 200])
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        if request.method == 'HEAD':
+            return httpx.Response(next(head_statuses))
+        return httpx.Response(200, json=[{'id': 1}])
+
+    result, failed_requests_num = _fetch(handler)
+    assert result == {'url': URL, 'status_code': 200, 'body': [{'id': 1}]}
+    assert failed_requests_num == 1
+    assert requests == ['HEAD', 'HEAD', 'GET']
+
+
+def test_fetch_gives_up_after_limit_of_attempts(monkeypatch):
+    monkeypatch.setattr(Config, 'RETRY_BACKOFF_START', 0)
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        return httpx.Response(502)
+
+    result, failed_requests_num = _fetch(handler)
+    assert result is None
+    assert failed_requests_num == Config.LIMIT_OF_ATTEMPTS_TO_RETRY
+    assert requests == ['HEAD'] * Config.LIMIT_OF_ATTEMPTS_TO_RETRY
+
+
+def test_fetch_does_not_retry_error_status_codes():
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        return httpx.Response(404)
+
+    result, failed_requests_num = _fetch(handler)
+    assert result is None
+    assert failed_requests_num == 0
+    assert requests == ['HEAD']
+
+
+def test_fetch_drops_empty_body():
+    result, failed_requests_num = _fetch(lambda request: httpx.Response(200, json=[]))
+    assert result is None
+    assert failed_requests_num == 0
+
+
+def test_fetch_survives_redirect_loop():
+    result, failed_requests_num = _fetch(
+        lambda request: httpx.Response(302, headers={'Location': URL}), follow_redirects=True)
+    assert result is None
+    assert failed_requests_num == 0
+
+
+def test_fetch_revalidates_cached_response():
+    cache = HttpCache()
+    cache.set_response(URL, 200, [{'id': 1}], etag='"abc"', last_modified=None)
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.headers.get('If-None-Match')))
+        return httpx.Response(304)
+
+    result, failed_requests_num = _fetch(handler, cache=cache)
+    assert result == {'url': URL, 'status_code': 200, 'body': [{'id': 1}]}
+    assert failed_requests_num == 0
+    assert requests == [('GET', '"abc"')]
+
+
+def _probe(handler, cache=None, **client_kwargs):
+    async def probe():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), **client_kwargs) as client:
+            return await probe_target_schema(client, 'example.com', cache)
+
+    return asyncio.run(probe())
+
+
+def test_probe_target_schema_https():
+    cache = HttpCache()
+    assert _probe(lambda request: httpx.Response(200, headers={'Server': 'nginx'}), cache) == 'https'
+    assert cache.get_schema('example.com') == 'https'
+
+
+def test_probe_target_schema_falls_back_to_http_on_errors():
+    for error in (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError):
+        def handler(request):
+            raise error('failed', request=request)
+
+        cache = HttpCache()
+        assert _probe(handler, cache) == 'http'
+        assert cache.get_schema('example.com') is None
+
+
+def test_probe_target_schema_falls_back_to_http_on_redirect_loop():
+    cache = HttpCache()
+    schema = _probe(
+        lambda request: httpx.Response(302, headers={'Location': 'https://example.com'}), cache,
+        follow_redirects=True)
+    assert schema == 'http'
+    assert cache.get_schema('example.com') is None
+
+
+def test_create_make_requests_yields_only_results():
+    responses = {
+        '/users': httpx.Response(200, json=[{'id': 1}]),
+        '/missing': httpx.Response(404),
+        '/empty': httpx.Response(200, json=[]),
+        '/user': httpx.Response(200, json={'id': 2}),
+    }
+    urls = [f'https://example.com{path}' for path in responses]
+
+    async def make_requests():
+        async with httpx.AsyncClient(
+                transport=httpx.MockTransport(lambda request: responses[request.url.path])) as client:
+            return [result async for result in RequestManager.create_make_requests(urls + urls, client)]
+
+    results = asyncio.run(make_requests())
+    assert sorted(results, key=lambda result: result['url']) == [
+        {'url': 'https://example.com/user', 'status_code': 200, 'body': {'id': 2}},
+        {'url': 'https://example.com/users', 'status_code': 200, 'body': [{'id': 1}]},
+    ]
+
+
+def test_create_make_requests_raises_worker_error():
+    urls = [f'https://example.com/users/{i}' for i in range(Config.SIMULTANEOUS_CONCURRENT_TASKS * 2)]
+
+    async def handler(request):
+        if request.url.path.endswith('/3'):
+            raise RuntimeError('boom')
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[{'id': 1}])
+
+    async def make_requests():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            try:
+                async for _ in RequestManager.create_make_requests(urls, client):
+                    pass
+            except RuntimeError as error:
+                await asyncio.sleep(0)
+                return error, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    error, pending_tasks = asyncio.run(make_requests())
+    assert str(error) == 'boom'
+    assert pending_tasks == []
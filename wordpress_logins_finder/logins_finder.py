@@ -7,14 +7,18 @@ that expose user details.
 """
 import argparse
 import asyncio
-import json
 import logging
 from time import time
-from typing import NamedTuple, List, Union, Dict
+from typing import NamedTuple, List, Union, Dict, Optional
 
-from utils.constants import Config, targets_to_check, Types
+import orjson
+
+from utils.constants import Config, targets_to_check
+from utils.http_cache import HttpCache
 from utils.logger_formater import OneLineExceptionFormatter
-from utils.request_manager import probe_target_schema, RequestManager
+from utils.request_manager import create_session, probe_target_schema, RequestManager
+
+log: logging.Logger = logging.getLogger(__name__)
 
 
 class RunConfig(NamedTuple):
@@ -24,6 +28,7 @@ class RunConfig(NamedTuple):
     domain: str
     verbose: bool = Config.DEFAULT_DEBUGGING
     output: str = Config.RESULT_FILE_NAME
+    cache: bool = Config.DEFAULT_CACHING
 
 
 def define_config_from_cmd(parsed_args: 'argparse.Namespace') -> RunConfig:
@@ -36,6 +41,7 @@ def define_config_from_cmd(parsed_args: 'argparse.Namespace') -> RunConfig:
         domain=parsed_args.domain,
         verbose=parsed_args.verbose,
         output=parsed_args.output,
+        cache=parsed_args.cache,
     )
 
 
@@ -51,18 +57,21 @@ def cli() -> argparse.Namespace:
                         required=False, help='Verbose debug messages')
     parser.add_argument('-o', '--output', type=str, default=Config.RESULT_FILE_NAME,
                         required=False, help='Output file name')
+    parser.add_argument('-c', '--cache', action='store_true', default=Config.DEFAULT_CACHING,
+                        required=False, help='Reuse schema and responses cached by previous runs')
 
     return parser.parse_args()
 
 
-def write_results_to_file(results: Types.ASYNCIO_GATHER) -> None:
+def write_results_to_file(results: List[Dict[str, Union[str, int]]], output: str) -> None:
     """
     Method to save results in json into a file
     :param results:
+    :param output: str - output file name
     """
-    with open(Config.RESULT_FILE_NAME, 'w') as file:
-        file.write(json.dumps(results))
-    logging.log(logging.DEBUG, f'Wrote results to file with name: {Config.RESULT_FILE_NAME}')
+    with open(output, 'wb') as file:
+        file.write(orjson.dumps(results))
+    log.debug('Wrote results to file with name: %s', output)
 
 
 async def main() -> None:
@@ -73,26 +82,38 @@ async def main() -> None:
     run_config: RunConfig = define_config_from_cmd(args)
 
     OneLineExceptionFormatter.logger_initialisation(run_config.verbose)
-    logging.log(logging.DEBUG, 'Main Started')
+    log.debug('Main Started')
 
-    schema: str = await probe_target_schema(run_config.domain)
-    logging.log(logging.DEBUG, f'Target Schema: {schema}')
-    target: str = f'{schema}://{run_config.domain}'
-    logging.log(logging.DEBUG, f'Target: {target}')
+    cache: Optional[HttpCache] = HttpCache.load() if run_config.cache else None
+    async with create_session() as session:
+        schema: str = await probe_target_schema(session, run_config.domain, cache)
+        log.debug('Target Schema: %s', schema)
+        target: str = f'{schema}://{run_config.domain}'
+        log.debug('Target: %s', target)
 
-    possible_urls: List[str] = targets_to_check(target)
-    logging.log(logging.DEBUG, f'Possible Targets: {possible_urls}')
+        possible_urls: List[str] = targets_to_check(target)
+        log.debug('Possible Targets: %s', possible_urls)
 
-    results: Types.ASYNCIO_GATHER = await RequestManager.create_make_requests(possible_urls)
-    results: List[Dict[str, Union[str, int]]] = list(filter(None, results))
+        results: List[Dict[str, Union[str, int]]] = [
+            result async for result in RequestManager.create_make_requests(possible_urls, session, cache)
+        ]
+    if cache:
+        cache.save()
 
-    write_results_to_file(results)
+    write_results_to_file(results, run_config.output)
 
 
 if __name__ == '__main__':
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        # uvloop is not available on Windows, fall back to the default event loop
+        pass
+
     try:
         start_time = time()
         asyncio.run(main(), debug=Config.DEFAULT_DEBUGGING)
-        logging.log(logging.DEBUG, f'Time consumption: {time() - start_time: 0.3f}s')
+        log.debug('Time consumption: %.3fs', time() - start_time)
     except Exception as error:
-        logging.exception(f'Failed with: {error}')
+        log.exception('Failed with: %s', error)
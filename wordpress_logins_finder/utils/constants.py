@@ -6,23 +6,27 @@ Types is for carrying complex types.
 import os
 import re
 from types import TracebackType
-from typing import Type, Union, Tuple, Optional, Any, List
+from typing import Type, Union, Tuple, Optional, List
+
+_SCHEME_RE: 're.Pattern[str]' = re.compile(r'^https?://')
 
 
 def strip_scheme(url: str) -> str:
-    return re.sub(r'^https?://', '', url)
+    return _SCHEME_RE.sub('', url, count=1)
 
 
 def targets_to_check(target: str) -> List[str]:
+    users_url: str = f'{target}/wp-json/wp/v2/users'
     target_urls: List[str] = [
         f'{target}/blog/wp-json/wp/v2/users',
         f'{target}/blog/?rest_route=/wp/v2/users',
-        f'{target}/wp-json/wp/v2/users',
+        users_url,
         f'{target}/section/news?rest_route=/wp/v2/users',
         f'{target}/section/news?rest_route=/wp/v2/usErs',
     ]
-    target_urls.extend([f'{target}/wp-json/wp/v2/users/{i}' for i in range(1, 1000)])
-    target_urls.append(f'{target}/wp-json/wp/v2/users?search=admin@{strip_scheme(target)}')
+    users_page_prefix: str = f'{users_url}?per_page={Config.USERS_PER_PAGE}&page='
+    target_urls.extend([users_page_prefix + str(page) for page in range(1, Config.USERS_PAGES_TO_CHECK + 1)])
+    target_urls.append(f'{users_url}?search=admin@{strip_scheme(target)}')
     return target_urls
 
 
@@ -31,24 +35,30 @@ class Config:
 
     TIMEOUT: int = 5
     TIMEOUT_DEFAULT: int = 60
-    LIMIT_OF_ATTEMPTS_TO_RETRY: int = os.environ.get('LIMIT_OF_ATTEMPTS_TO_RETRY', 5)
+    LIMIT_OF_ATTEMPTS_TO_RETRY: int = int(os.environ.get('LIMIT_OF_ATTEMPTS_TO_RETRY', 5))
+    RETRY_BACKOFF_START: float = 0.2
+    RETRY_BACKOFF_MAX: float = 10
     SIMULTANEOUS_CONCURRENT_TASKS: int = 51
-    REQUESTS_RETRIES_NUM_TO_REMOVE: int = 1
+    KEEPALIVE_TIMEOUT: int = 75
+    MAX_RESPONSE_SIZE: int = 1024 * 1024
+    USERS_PER_PAGE: int = 100
+    USERS_PAGES_TO_CHECK: int = 10
 
     ERRORS_STATUS_CODES: List[int] = [400, 403, 404, 500, ]
+    RETRY_STATUS_CODES: List[int] = [502, 503, 504, ]
 
     DEFAULT_DEBUGGING: bool = os.environ.get('DEFAULT_DEBUGGING', False)
+    DEFAULT_CACHING: bool = False
 
     USER_AGENT: str = 'Mozilla/5.0 (Windows NT 10.0; WOW64) AppleWebKit/537.36 (KHTML, like Gecko)' \
                       ' Chrome/85.0.4183.102 Safari/537.36'
 
     RESULT_FILE_NAME: str = os.environ.get('RESULT_FILE_NAME', 'results.json')
+    SCHEMA_CACHE_TTL: int = 24 * 60 * 60
+    CACHE_FILE_PATH: str = os.path.expanduser(
+        os.environ.get('CACHE_FILE_PATH', os.path.join('~', '.cache', 'wp-logins-finder', 'http_cache.json')))
 
 
 class Types:
     """Types with bunch of complex types"""
     EXC_INFO: Type = Union[Tuple[type, BaseException, Optional[TracebackType]], tuple[None, None, None]]
-    ASYNCIO_GATHER: Type = Tuple[
-        Union[BaseException, Any], Union[BaseException, Any],
-        Union[BaseException, Any], Union[BaseException, Any], Union[BaseException, Any]
-    ]
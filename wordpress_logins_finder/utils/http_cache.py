@@ -0,0 +1,171 @@
+"""
+HTTP cache module
+Keeps probed schemas, responses validators and bodies between runs
+to make conditional requests
+"""
+
+import logging
+import os
+from time import time
+from typing import Any, Callable, Dict, Optional, Union
+
+import orjson
+
+from .constants import Config
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    """
+    On-disk cache of probed schemas and responses
+    """
+
+    def __init__(self, path: str = Config.CACHE_FILE_PATH):
+        self._path: str = path
+        self._schemas: Dict[str, Dict[str, Union[str, float]]] = {}
+        self._responses: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: str = Config.CACHE_FILE_PATH) -> 'HttpCache':
+        """
+        Class method to load cache from a file
+        Missing or broken file gives an empty cache, malformed entries are skipped
+        :param path: str - path to the cache file
+        :return: HttpCache
+        """
+        cache: HttpCache = cls(path=path)
+        try:
+            with open(path, 'rb') as file:
+                content: Any = orjson.loads(file.read())
+        except (OSError, ValueError) as error:
+            log.debug('Cache was not loaded from file with name: %s Error: %s', path, error)
+            return cache
+        if not isinstance(content, dict):
+            log.debug('Cache was not loaded from file with name: %s Error: unexpected content', path)
+            return cache
+        cache._schemas = _valid_entries(content.get('schemas'), _is_valid_schema)
+        cache._responses = _valid_entries(content.get('responses'), _is_valid_response)
+        return cache
+
+    def save(self) -> None:
+        """
+        Method to save cache into the file
+        """
+        os.makedirs(os.path.dirname(self._path) or '.', exist_ok=True)
+        with open(self._path, 'wb') as file:
+            file.write(orjson.dumps({'schemas': self._schemas, 'responses': self._responses}))
+        log.debug('Wrote cache to file with name: %s', self._path)
+
+    def get_schema(self, target: str) -> Optional[str]:
+        """
+        Getter for probed schema of the target
+        Schemas probed more than Config.SCHEMA_CACHE_TTL seconds ago are expired
+        :param target: str - target domain name
+        :return: Optional[str] - url schema
+        """
+        cached: Optional[Dict[str, Union[str, float]]] = self._schemas.get(target)
+        if cached is None or time() - cached['probed_at'] > Config.SCHEMA_CACHE_TTL:
+            return None
+        return cached['schema']
+
+    def set_schema(self, target: str, schema: str) -> None:
+        """
+        Setter for probed schema of the target
+        :param target: str - target domain name
+        :param schema: str - url schema
+        """
+        self._schemas[target] = {'schema': schema, 'probed_at': time()}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Method to build conditional request headers from cached validators
+        :param url: str
+        :return: Dict[str, str] - headers, empty if url is not cached
+        """
+        cached: Optional[Dict[str, Any]] = self._responses.get(url)
+        if cached is None:
+            return {}
+        headers: Dict[str, str] = {}
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def get_response(self, url: str) -> Optional[Dict[str, Union[str, int]]]:
+        """
+        Getter for cached response
+        :param url: str
+        :return: Optional[Dict[str, Union[str, int]]] - dictionary with results
+        """
+        cached: Optional[Dict[str, Any]] = self._responses.get(url)
+        if cached is None:
+            return None
+        return {
+            'url': url,
+            'status_code': cached['status_code'],
+            'body': cached['body'],
+        }
+
+    def set_response(
+            self, url: str, status_code: int, body: Any, etag: Optional[str], last_modified: Optional[str],
+    ) -> None:
+        """
+        Setter for response
+        Responses without validators can not be revalidated, so they are not kept
+        :param url: str
+        :param status_code: int
+        :param body: Any - decoded json body
+        :param etag: Optional[str] - ETag header
+        :param last_modified: Optional[str] - Last-Modified header
+        """
+        if not etag and not last_modified:
+            self.delete_response(url)
+            return
+        self._responses[url] = {
+            'status_code': status_code,
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+        }
+
+    def delete_response(self, url: str) -> None:
+        """
+        Method to remove cached response
+        :param url: str
+        """
+        self._responses.pop(url, None)
+
+
+def _is_valid_schema(entry: Any) -> bool:
+    """
+    Function to check cached schema entry
+    :param entry: Any - loaded entry
+    :return: bool
+    """
+    return isinstance(entry, dict) and entry.get('schema') in ('http', 'https') \
+        and isinstance(entry.get('probed_at'), (int, float))
+
+
+def _is_valid_response(entry: Any) -> bool:
+    """
+    Function to check cached response entry
+    :param entry: Any - loaded entry
+    :return: bool
+    """
+    return isinstance(entry, dict) and isinstance(entry.get('status_code'), int) and 'body' in entry \
+        and isinstance(entry.get('etag'), (str, type(None))) \
+        and isinstance(entry.get('last_modified'), (str, type(None)))
+
+
+def _valid_entries(section: Any, is_valid: Callable[[Any], bool]) -> Dict[str, Any]:
+    """
+    Function to keep only valid entries of loaded cache section
+    :param section: Any - loaded section
+    :param is_valid: Callable[[Any], bool] - entry check
+    :return: Dict[str, Any] - valid entries
+    """
+    if not isinstance(section, dict):
+        return {}
+    return {key: entry for key, entry in section.items() if is_valid(entry)}
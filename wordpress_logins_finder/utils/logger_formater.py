@@ -7,6 +7,7 @@ Module to format multiline Exception into regular string
 
 import os
 import logging
+from typing import Callable
 
 from .constants import Types
 
@@ -17,6 +18,13 @@ class OneLineExceptionFormatter(logging.Formatter):
     To format multiline Exception into regular string
     """
 
+    def __init__(self, *args, **kwargs):
+        """
+        Binds parent format method once to skip its lookup on every record
+        """
+        super().__init__(*args, **kwargs)
+        self._super_format: Callable[[logging.LogRecord], str] = super().format
+
     def formatException(self, exc_info: Types.EXC_INFO) -> str:
         """
         Method to format Exception into string
@@ -32,8 +40,10 @@ class OneLineExceptionFormatter(logging.Formatter):
         :param: logging.LogRecord - record:
         :return: str
         """
+        if not record.exc_info and not record.exc_text:
+            return self._super_format(record)
         # noinspection StrFormat
-        result = super().format(record)
+        result = self._super_format(record)
         if record.exc_text:
             result = result.replace('\n', '')
         return result
@@ -42,12 +52,15 @@ class OneLineExceptionFormatter(logging.Formatter):
     def logger_initialisation(cls, debug: bool = False) -> None:
         """
         Method for logger initialisation
+        Only the script's loggers (entrypoint and this package) are configured,
+        so third-party debug output (httpx, httpcore, h2, hpack) stays quiet
         :param debug: bool - debug mod turn on or turn off
         """
         debug_level: bool = debug and 'DEBUG' or 'INFO'
         handler: logging.StreamHandler = logging.StreamHandler()
         formatter: OneLineExceptionFormatter = cls(logging.BASIC_FORMAT)
         handler.setFormatter(formatter)
-        root: logging.Logger = logging.getLogger('chardet.charsetprober')
-        root.setLevel(os.environ.get('LOGLEVEL', debug_level))
-        root.addHandler(handler)
+        for name in ('__main__', __package__):
+            logger: logging.Logger = logging.getLogger(name)
+            logger.setLevel(os.environ.get('LOGLEVEL', debug_level))
+            logger.addHandler(handler)
@@ -4,18 +4,19 @@ Request manager module
 
 import asyncio
 import logging
-from asyncio import BoundedSemaphore
-# noinspection PyCompatibility
-from asyncio.exceptions import TimeoutError
+import random
 from dataclasses import dataclass, field
-from typing import Union, Dict, List
+from http import HTTPStatus
+from typing import AsyncIterator, Union, Dict, List, Optional, Tuple
 
-from aiohttp import ClientSession, ClientTimeout, InvalidURL, \
-    ClientConnectorError, ClientResponseError, ServerTimeoutError, \
-    TCPConnector, ServerDisconnectedError, ClientOSError
-from yarl import URL
+import orjson
+from httpx import AsyncClient, InvalidURL, Limits, RequestError, Response, Timeout, TooManyRedirects, \
+    TransportError, UnsupportedProtocol
 
-from .constants import Config, Types
+from .constants import Config
+from .http_cache import HttpCache
+
+log: logging.Logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -23,122 +24,175 @@ class RequestManager:
     """
     Request Manager to make request to targets urls
     """
-    _urls: List[URL]
-    _timeout: ClientTimeout
-    _session: ClientSession
-    _semaphore: BoundedSemaphore
+    _urls: List[str]
+    _session: AsyncClient
+    _cache: Optional[HttpCache]
     _failed_requests_num: int = field(default=0)
 
     # _headers: Dict[str, str] = field(default_factory={'User-agent': Config.USER_AGENT})
 
-    def __init__(self, urls: List[str], timeout: int = Config.TIMEOUT_DEFAULT):
-        self._urls: List[URL] = [URL(url) for url in urls]
-        self._timeout: ClientTimeout = ClientTimeout(total=timeout)
-        self._session: ClientSession = ClientSession(timeout=self.timeout, connector=TCPConnector(ssl=False))
-        self._semaphore: asyncio.BoundedSemaphore = asyncio.BoundedSemaphore(Config.SIMULTANEOUS_CONCURRENT_TASKS)
+    def __init__(self, urls: List[str], session: AsyncClient, cache: Optional[HttpCache] = None):
+        self._urls: List[str] = list(dict.fromkeys(urls))
+        self._session: AsyncClient = session
+        self._cache: Optional[HttpCache] = cache
         self._headers: Dict[str, str] = {'User-agent': Config.USER_AGENT}
 
     @classmethod
-    async def create_make_requests(cls, urls: List[str], timeout: int = Config.TIMEOUT_DEFAULT) -> Types.ASYNCIO_GATHER:
+    async def create_make_requests(
+            cls, urls: List[str], session: AsyncClient, cache: Optional[HttpCache] = None,
+    ) -> AsyncIterator[Dict[str, Union[str, int]]]:
         """
         Class method to make requests
         :param urls: - List[str] - set of urls
-        :param timeout: int
-        :return: Types.ASYNCIO_GATHER - request of the requests
+        :param session: AsyncClient - shared client
+        :param cache: Optional[HttpCache] - cache of previous responses, None to not use cache
+        :return: AsyncIterator[Dict[str, Union[str, int]]] - results of the requests as they complete
         """
-        obj: RequestManager = cls(urls=urls, timeout=timeout)
-        logging.log(logging.DEBUG, f'{obj.__class__} created')
-        results = await obj.make_requests()
-        logging.log(logging.DEBUG, f'Number failed results: {obj.failed_requests_num}')
-        return results
+        obj: RequestManager = cls(urls=urls, session=session, cache=cache)
+        log.debug('%s created', obj.__class__)
+        async for result in obj.make_requests():
+            yield result
+        log.debug('Number failed results: %s', obj.failed_requests_num)
 
-    async def _fetch(self, url: URL, session: ClientSession) -> Dict[str, Union[str, int]]:
+    async def _fetch(self, url: str, session: AsyncClient) -> Optional[Dict[str, Union[str, int]]]:
         """
-        Method to perform requests
+        Method to perform request
         With retry functionality
-        :return: Dict[str, Union[str, int]] - dictionary with results
-        """
-        logging.log(logging.DEBUG, f'Request to url: "{url}" started')
-        async with self.semaphore:
-            left_of_attempts_to_retry: int = Config.LIMIT_OF_ATTEMPTS_TO_RETRY
-            while left_of_attempts_to_retry:
-                try:
-                    async with session.get(url, headers=self.headers) as response:
-                        status_code: int = response.status
-                        if status_code not in Config.ERRORS_STATUS_CODES:
-                            return {
-                                'url': str(url),
-                                'status_code': status_code,
-                                'body': await response.json(),
-                            }
-                except (
-                        ClientConnectorError, ClientResponseError, ServerTimeoutError,
-                        TimeoutError, ServerDisconnectedError, ClientOSError,
-                ) as e:
-                    attempts = Config.LIMIT_OF_ATTEMPTS_TO_RETRY - left_of_attempts_to_retry + \
-                               Config.REQUESTS_RETRIES_NUM_TO_REMOVE
-                    logging.exception(f'Failed attempt num: {attempts} Error: {e}')
-                    left_of_attempts_to_retry -= Config.REQUESTS_RETRIES_NUM_TO_REMOVE
-                    self.failed_requests_num = Config.REQUESTS_RETRIES_NUM_TO_REMOVE
-                except (UnicodeDecodeError, InvalidURL,):
-                    break
-                else:
-                    logging.log(
-                        logging.DEBUG,
-                        f'Request to url: "{url}" succeed with possible retries: {left_of_attempts_to_retry}')
-                    break
-
-    async def make_requests(self) -> Types.ASYNCIO_GATHER:
-        """
-        Method to create coroutines with asyncio
-        :return: Types.ASYNCIO_GATHER - request's coroutines
-        """
-        async with self.session as session:
-            return await asyncio.gather(*[
-                asyncio.create_task(
-                    self._fetch(url=url, session=session)
-                ) for url in self.urls
-            ])
-
-    @property
-    def urls(self) -> List[URL]:
-        """
-        Getter for urls property
-        :return: List[URL]
+        Cached responses are revalidated with conditional request,
+        others are probed with HEAD request to skip error bodies download
+        :return: Optional[Dict[str, Union[str, int]]] - dictionary with results
         """
-        return self._urls
+        log.debug('Request to url: "%s" started', url)
+        conditional_headers: Dict[str, str] = self._cache.conditional_headers(url) if self._cache else {}
+        headers: Dict[str, str] = {**self._headers, **conditional_headers}
+        head_passed: bool = bool(conditional_headers)
+        for attempt in range(1, Config.LIMIT_OF_ATTEMPTS_TO_RETRY + 1):
+            if attempt > 1:
+                await asyncio.sleep(retry_delay(attempt))
+            try:
+                status_code: int = HTTPStatus.OK
+                if not head_passed:
+                    status_code = (await session.head(url, headers=headers)).status_code
+                result: Optional[Dict[str, Union[str, int]]] = None
+                if status_code not in Config.ERRORS_STATUS_CODES and status_code not in Config.RETRY_STATUS_CODES:
+                    head_passed = True
+                    status_code, result = await self._get(url, session, headers)
+                if status_code in Config.ERRORS_STATUS_CODES:
+                    log.debug('Request to url: "%s" failed with: %s', url, status_code)
+                    if self._cache:
+                        self._cache.delete_response(url)
+                    return None
+                if status_code not in Config.RETRY_STATUS_CODES:
+                    log.debug('Request to url: "%s" succeed with attempt num: %s', url, attempt)
+                    return result
+                log.warning('Failed attempt num: %s Status code: %s', attempt, status_code)
+            except (UnicodeDecodeError, InvalidURL, UnsupportedProtocol, orjson.JSONDecodeError,):
+                return None
+            except TransportError as e:
+                log.warning('Failed attempt num: %s Error: %s', attempt, e)
+            except RequestError as e:
+                log.warning('Request to url: "%s" failed with: %s', url, e)
+                return None
+            self._failed_requests_num += 1
+        return None
 
-    @property
-    def timeout(self) -> ClientTimeout:
+    async def _get(
+            self, url: str, session: AsyncClient, headers: Dict[str, str],
+    ) -> Tuple[int, Optional[Dict[str, Union[str, int]]]]:
         """
-        Getter for timeout property for Client timeout
-        :return: ClientTimeout
+        Method to perform GET request and build result from its response
+        Error, retry and not modified statuses are left to the caller
+        :return: Tuple[int, Optional[Dict[str, Union[str, int]]]] - status code and dictionary with results
         """
-        return self._timeout
+        async with session.stream('GET', url, headers=headers) as response:
+            status_code: int = response.status_code
+            if status_code == HTTPStatus.NOT_MODIFIED:
+                log.debug('Request to url: "%s" is not modified, cache is used', url)
+                return status_code, self._cache.get_response(url) if self._cache else None
+            if status_code in Config.ERRORS_STATUS_CODES or status_code in Config.RETRY_STATUS_CODES:
+                return status_code, None
+            raw_body: Optional[bytes] = await self._read_body(url, response)
+            body = None
+            if raw_body is not None:
+                body = orjson.loads(raw_body)
+                if not body:
+                    log.debug('Request to url: "%s" returned empty body', url)
+                    if self._cache:
+                        self._cache.delete_response(url)
+                    return status_code, None
+                if self._cache:
+                    self._cache.set_response(
+                        url, status_code, body,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'),
+                    )
+            return status_code, {
+                'url': url,
+                'status_code': status_code,
+                'body': body,
+            }
 
-    @property
-    def session(self) -> ClientSession:
+    @staticmethod
+    async def _read_body(url: str, response: Response) -> Optional[bytes]:
         """
-        Getter for Client Session property
-        :return: ClientSession
+        Method to read response body by chunks
+        Bodies bigger than Config.MAX_RESPONSE_SIZE are not read
+        :param url: str
+        :param response: Response - streamed response
+        :return: Optional[bytes] - body or None if it is too large
         """
-        return self._session
+        content_length: str = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > Config.MAX_RESPONSE_SIZE:
+            log.warning('Response from url: "%s" is too large: %s', url, content_length)
+            return None
+        chunks: List[bytes] = []
+        size: int = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > Config.MAX_RESPONSE_SIZE:
+                log.warning('Response from url: "%s" is too large: over %s', url, size)
+                return None
+            chunks.append(chunk)
+        return b''.join(chunks)
 
-    @property
-    def semaphore(self) -> BoundedSemaphore:
+    async def _worker(self, queue: asyncio.Queue, results: asyncio.Queue) -> None:
         """
-        Getter for BoundSemaphore property
-        :return: BoundedSemaphore
+        Worker to perform requests for urls taken from the queue
+        Unexpected errors are passed to results to be raised by the consumer
+        :param queue: asyncio.Queue - queue with urls
+        :param results: asyncio.Queue - queue to put results in
         """
-        return self._semaphore
+        while not queue.empty():
+            url: str = queue.get_nowait()
+            try:
+                result: Union[Optional[Dict[str, Union[str, int]]], Exception] = await self._fetch(
+                    url=url, session=self._session)
+            except Exception as error:
+                result = error
+            results.put_nowait(result)
 
-    @property
-    def headers(self) -> Dict[str, str]:
+    async def make_requests(self) -> AsyncIterator[Dict[str, Union[str, int]]]:
         """
-        Getter for dictionary with headers
-        :return: Dict[str, str]
+        Method to perform requests with a fixed pool of workers
+        :return: AsyncIterator[Dict[str, Union[str, int]]] - successful results as they complete
         """
-        return self._headers
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in self._urls:
+            queue.put_nowait(url)
+        results: asyncio.Queue = asyncio.Queue()
+        workers: List[asyncio.Task] = [
+            asyncio.create_task(self._worker(queue, results)) for _ in range(Config.SIMULTANEOUS_CONCURRENT_TASKS)
+        ]
+        try:
+            for _ in self._urls:
+                result: Union[Optional[Dict[str, Union[str, int]]], Exception] = await results.get()
+                if isinstance(result, Exception):
+                    raise result
+                if result:
+                    yield result
+        finally:
+            for worker in workers:
+                worker.cancel()
 
     @property
     def failed_requests_num(self) -> int:
@@ -150,20 +204,56 @@ class RequestManager:
         """
         return self._failed_requests_num
 
-    @failed_requests_num.setter
-    def failed_requests_num(self, num: int) -> None:
-        self._failed_requests_num += num
 
+def retry_delay(attempt: int) -> float:
+    """
+    Function to calculate exponential backoff with jitter before retry
+    :param attempt: int - number of the attempt to be made, starting from 2
+    :return: float - delay in seconds
+    """
+    delay: float = min(Config.RETRY_BACKOFF_MAX, Config.RETRY_BACKOFF_START * 2 ** (attempt - 2))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def create_session(timeout: int = Config.TIMEOUT_DEFAULT) -> AsyncClient:
+    """
+    Function to create HTTP/2 client shared by the schema probe and the requests
+    Requests to the same host are multiplexed over a single connection
+    :param timeout: int
+    :return: AsyncClient
+    """
+    return AsyncClient(
+        http2=True,
+        verify=False,
+        follow_redirects=True,
+        timeout=Timeout(timeout),
+        limits=Limits(
+            max_connections=Config.SIMULTANEOUS_CONCURRENT_TASKS,
+            max_keepalive_connections=Config.SIMULTANEOUS_CONCURRENT_TASKS,
+            keepalive_expiry=Config.KEEPALIVE_TIMEOUT,
+        ),
+    )
 
-async def probe_target_schema(target: str) -> str:
+
+async def probe_target_schema(session: AsyncClient, target: str, cache: Optional[HttpCache] = None) -> str:
     """
     Function to probe if project uses http or https
+    Schema probed on previous runs is taken from cache
+    Fallback to http on connection or redirect error is not cached
+    :param session: AsyncClient - shared client
     :param target: str - target domain name
+    :param cache: Optional[HttpCache] - cache with previously probed schemas, None to not use cache
     :return: str - url schema
     """
-    async with ClientSession() as session:
-        try:
-            async with session.get(f'https://{target}') as response:
-                return 'https' if response.headers else 'http'
-        except ClientConnectorError:
-            return 'http'
+    schema: Optional[str] = cache.get_schema(target) if cache else None
+    if schema:
+        return schema
+    try:
+        async with session.stream('GET', f'https://{target}') as response:
+            schema = 'https' if response.headers else 'http'
+    except (TransportError, TooManyRedirects) as error:
+        log.debug('Probe of "https://%s" failed with: %s', target, error)
+        return 'http'
+    if cache:
+        cache.set_schema(target, schema)
+    return schema